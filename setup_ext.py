@@ -0,0 +1,32 @@
+"""Build the compiled XML parser extension in place:
+
+    python setup_ext.py build_ext --inplace
+
+Needs the libxml2 development headers (libxml2-dev). xml_parsing.py
+picks up the resulting xml_parse_ext module automatically and falls
+back to its pure-Python parser when it is absent.
+"""
+import subprocess
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+
+def libxml2_include_dirs():
+    """Locate the libxml2 headers via xml2-config, with the usual fallback."""
+    try:
+        cflags = subprocess.check_output(['xml2-config', '--cflags'], text=True)
+        return [flag[2:] for flag in cflags.split() if flag.startswith('-I')]
+    except (OSError, subprocess.CalledProcessError):
+        return ['/usr/include/libxml2']
+
+
+setup(
+    name='xml_parse_ext',
+    ext_modules=cythonize(
+        [Extension('xml_parse_ext', ['xml_parse_ext.pyx'],
+                   include_dirs=libxml2_include_dirs(),
+                   libraries=['xml2'])],
+        language_level=3,
+    ),
+)
@@ -0,0 +1,159 @@
+# distutils: libraries = xml2
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled per-file XML parser for xml_parsing.py, bound to libxml2 SAX.
+
+Build in place with:
+
+    python setup_ext.py build_ext --inplace
+
+The SAX callbacks run entirely in C: element names go through a
+precomputed xmlHashTable of the ten wanted local names, characters are
+gathered into a fixed buffer, and numeric fields are converted with
+strtod into a double array. Irrelevant elements cost one hash lookup
+and no Python work at all, so large labels with thousands of unwanted
+tags parse at libxml2 speed.
+"""
+from libc.string cimport strchr, memcpy, memset
+from libc.stdlib cimport strtod
+
+cdef extern from "libxml/hash.h":
+    ctypedef struct xmlHashTable
+    ctypedef xmlHashTable* xmlHashTablePtr
+    xmlHashTablePtr xmlHashCreate(int size)
+    int xmlHashAddEntry(xmlHashTablePtr table, const unsigned char* name,
+                        void* userdata)
+    void* xmlHashLookup(xmlHashTablePtr table, const unsigned char* name)
+
+cdef extern from "libxml/parser.h":
+    ctypedef unsigned char xmlChar
+    ctypedef void (*startElementSAXFunc)(void* ctx, const xmlChar* name,
+                                         const xmlChar** atts)
+    ctypedef void (*endElementSAXFunc)(void* ctx, const xmlChar* name)
+    ctypedef void (*charactersSAXFunc)(void* ctx, const xmlChar* ch, int length)
+    ctypedef struct xmlSAXHandler:
+        startElementSAXFunc startElement
+        endElementSAXFunc endElement
+        charactersSAXFunc characters
+    int xmlSAXUserParseFile(xmlSAXHandler* sax, void* user_data,
+                            const char* filename)
+
+# Field order mirrors WANTED in xml_parsing.py: the two time strings first,
+# then the eight coordinate floats
+FIELD_NAMES = ('start_date_time', 'stop_date_time',
+               'upper_left_latitude', 'upper_left_longitude',
+               'upper_right_latitude', 'upper_right_longitude',
+               'lower_left_latitude', 'lower_left_longitude',
+               'lower_right_latitude', 'lower_right_longitude')
+
+DEF N_FIELDS = 10
+DEF N_TIME = 2
+DEF BUF_SIZE = 256
+
+# Field status codes in ParseState.status
+DEF F_UNSEEN = 0
+DEF F_OK = 1
+DEF F_BAD = 2   # seen, but empty or not convertible -> None
+
+cdef struct ParseState:
+    int current                     # field index being captured, or -1
+    int buf_len
+    char buf[BUF_SIZE]
+    int status[N_FIELDS]
+    double values[N_FIELDS]
+    char times[N_TIME][BUF_SIZE]
+
+# Precomputed perfect lookup of the wanted local names; payload is the
+# field index + 1 so that a miss (NULL) is distinguishable from field 0
+cdef xmlHashTablePtr _WANTED = xmlHashCreate(N_FIELDS * 2)
+for _i, _name in enumerate(FIELD_NAMES):
+    xmlHashAddEntry(_WANTED, _name.encode('ascii'), <void*> <size_t> (_i + 1))
+
+
+cdef void _on_start(void* ctx, const xmlChar* name,
+                    const xmlChar** attrs) noexcept:
+    cdef ParseState* state = <ParseState*> ctx
+    cdef const char* local = strchr(<const char*> name, c':')
+    cdef void* hit
+    cdef int idx
+    if local is NULL:
+        local = <const char*> name
+    else:
+        local += 1
+    hit = xmlHashLookup(_WANTED, <const unsigned char*> local)
+    if hit is NULL:
+        state.current = -1
+        return
+    idx = <int> (<size_t> hit) - 1
+    if state.status[idx] != F_UNSEEN:
+        state.current = -1
+        return
+    state.current = idx
+    state.buf_len = 0
+
+
+cdef void _on_chars(void* ctx, const xmlChar* ch, int length) noexcept:
+    cdef ParseState* state = <ParseState*> ctx
+    if state.current < 0:
+        return
+    if state.buf_len + length >= BUF_SIZE:
+        length = BUF_SIZE - 1 - state.buf_len
+        if length <= 0:
+            return
+    memcpy(state.buf + state.buf_len, ch, length)
+    state.buf_len += length
+
+
+cdef void _on_end(void* ctx, const xmlChar* name) noexcept:
+    cdef ParseState* state = <ParseState*> ctx
+    cdef int idx = state.current
+    cdef char* endptr
+    if idx < 0:
+        return
+    state.current = -1
+    state.buf[state.buf_len] = 0
+    if state.buf_len == 0:
+        state.status[idx] = F_BAD
+        return
+    if idx < N_TIME:
+        memcpy(state.times[idx], state.buf, state.buf_len + 1)
+        state.status[idx] = F_OK
+    else:
+        # strtod stops at the first non-numeric character, which also
+        # handles trailing unit tokens such as '12.5 deg'
+        state.values[idx] = strtod(state.buf, &endptr)
+        state.status[idx] = F_OK if endptr != state.buf else F_BAD
+
+
+def parse_xml_file(str file_path):
+    """Parse an XML file and extract specific parameters as a dictionary."""
+    cdef ParseState state
+    cdef xmlSAXHandler sax
+    cdef bytes path_bytes = file_path.encode()
+    cdef dict params = {}
+    cdef int i
+
+    memset(&state, 0, sizeof(state))
+    state.current = -1
+    memset(&sax, 0, sizeof(sax))
+    sax.startElement = _on_start
+    sax.endElement = _on_end
+    sax.characters = _on_chars
+
+    if xmlSAXUserParseFile(&sax, &state, path_bytes) != 0:
+        print(f"Error parsing {file_path}")
+        return None
+
+    for i in range(N_FIELDS):
+        if state.status[i] == F_UNSEEN:
+            continue
+        if state.status[i] == F_OK:
+            if i < N_TIME:
+                params[FIELD_NAMES[i]] = state.times[i].decode()
+            else:
+                params[FIELD_NAMES[i]] = state.values[i]
+        else:
+            if i >= N_TIME:
+                print(f"Error converting value for {FIELD_NAMES[i]} in {file_path}")
+            params[FIELD_NAMES[i]] = None
+
+    return params